@@ -4,6 +4,7 @@ import asyncio
 import json
 import math
 import subprocess
+import threading
 from fractions import Fraction
 from pathlib import Path
 
@@ -26,6 +27,12 @@ class FFmpegTimeoutError(FFmpegError):
 # 10 minutes timeout for FFmpeg operations
 FFMPEG_TIMEOUT = 600
 
+# Async ffmpeg runs are killed on *stall* rather than wall clock: ffmpeg
+# emits a -progress block every ~half second while making any headway, so
+# this much silence means a wedged process — while a legitimately long
+# re-encode may run far past any fixed total budget.
+FFMPEG_IDLE_TIMEOUT = 30
+
 
 def get_video_duration(video_path: str) -> float:
     """Get video duration in seconds using ffprobe."""
@@ -35,8 +42,10 @@ def get_video_duration(video_path: str) -> float:
         "-of", "default=noprint_wrappers=1:nokey=1",
         video_path
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return float(result.stdout.strip())
+    # float() takes the raw bytes directly (whitespace included) — no text
+    # decode, and no stderr pipe since we never read it.
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return float(result.stdout)
 
 
 def parse_rate(rate: str | None) -> float:
@@ -101,6 +110,33 @@ def probe_video_metadata(path: Path | str) -> dict:
     }
 
 
+# path -> ((mtime_ns, size), metadata). Keyed like read_jsonl_cached so a
+# re-downloaded or re-cut video invalidates its entry naturally. Entries are
+# four floats; no eviction needed for a library of hundreds of videos.
+_probe_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+_probe_cache_lock = threading.Lock()
+
+
+def probe_video_metadata_cached(path: Path | str) -> dict:
+    """``probe_video_metadata`` behind an mtime-keyed cache.
+
+    The web UI probes the same video on every page load (and the video list
+    probes all of them in a loop) — each probe is a full ffprobe subprocess
+    for values that only change when the file does.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _probe_cache_lock:
+        hit = _probe_cache.get(path)
+        if hit and hit[0] == key:
+            return hit[1]
+    meta = probe_video_metadata(path)  # subprocess outside the lock
+    with _probe_cache_lock:
+        _probe_cache[path] = (key, meta)
+    return meta
+
+
 def extract_clip(video_path: str, start_time: float, duration: float, output_path: str) -> bool:
     """Extract a clip from video using ffmpeg.
 
@@ -123,6 +159,9 @@ def extract_clip(video_path: str, start_time: float, duration: float, output_pat
         "-i", video_path,
         "-t", str(duration),
         "-c:v", "copy",
+        # Stream copy starts at the keyframe at/before -ss, which can leave
+        # negative timestamps some demuxers choke on; shift to zero instead.
+        "-avoid_negative_ts", "make_zero",
         "-an",  # No audio
         output_path
     ]
@@ -169,17 +208,36 @@ async def export_segment(source: Path | str, start: float, end: float, output: P
 
 
 async def _run_ffmpeg(cmd: list[str], output: Path | str) -> None:
+    """Run an ffmpeg command, killing it after FFMPEG_IDLE_TIMEOUT s of no progress."""
+    # -progress on stdout is the liveness signal; -nostats keeps stderr to
+    # actual diagnostics for the error message below. The output path is
+    # always the final argument, so the flags slot in just before it.
+    cmd = cmd[:-1] + ["-progress", "pipe:1", "-nostats", cmd[-1]]
     proc = await asyncio.create_subprocess_exec(
         *cmd,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    try:
-        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=FFMPEG_TIMEOUT)
-    except asyncio.TimeoutError as e:
-        proc.kill()
-        await proc.wait()
-        raise FFmpegTimeoutError(str(output), FFMPEG_TIMEOUT) from e
+    # Drain stderr concurrently so a chatty ffmpeg never blocks on a full pipe.
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    while True:
+        try:
+            line = await asyncio.wait_for(proc.stdout.readline(), timeout=FFMPEG_IDLE_TIMEOUT)
+        except asyncio.TimeoutError as e:
+            proc.kill()
+            stderr_task.cancel()
+            try:
+                # Reaping is normally instant after SIGKILL, but Process.wait
+                # also waits on the pipes — don't let anything still holding
+                # them postpone the timeout error.
+                await asyncio.wait_for(proc.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+            raise FFmpegTimeoutError(str(output), FFMPEG_IDLE_TIMEOUT) from e
+        if not line:  # EOF — ffmpeg exited
+            break
+    stderr = await stderr_task
+    await proc.wait()
     if proc.returncode != 0:
         raise FFmpegError(f"FFmpeg failed with code {proc.returncode}: {stderr.decode()[:200]}")
 
@@ -3,9 +3,8 @@
 Centralizes math that previously appeared in several modules with subtly
 different fallbacks.
 
-For container-precise duration in seconds prefer
-``yp_video.core.ffmpeg.get_video_duration`` (uses ffprobe). The cv2 path here
-trades accuracy for skipping a subprocess in tight loops.
+For container-precise duration in seconds use
+``yp_video.core.ffmpeg.get_video_duration`` (uses ffprobe).
 """
 
 from __future__ import annotations
@@ -59,22 +58,41 @@ def get_fps(video_path: Path | str) -> float:
     return DEFAULT_FPS
 
 
-def get_video_duration_cv2(video_path: Path | str) -> float:
-    """Estimate duration via cv2's frame count / fps. Returns 0.0 on error.
+def clip_motion_score(video_path: Path | str, num_frames: int = 4) -> float:
+    """Mean absolute inter-frame difference over a few downscaled gray frames.
 
-    Faster than ffprobe in tight loops but reports header-declared duration,
-    which may diverge from the actual track on poorly-muxed files. Use
-    ``yp_video.core.ffmpeg.get_video_duration`` when you need accuracy.
+    A cheap "is anything moving?" probe for short clips: true stills
+    (scoreboards, title cards) score near zero, while even quiet game footage
+    scores an order of magnitude higher. Returns ``inf`` when the clip cannot
+    be read, so callers gating expensive work on a low score never skip on
+    probe failure.
     """
     try:
         import cv2  # type: ignore
+
         cap = cv2.VideoCapture(str(video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total < 2:
+            cap.release()
+            return float("inf")
+        grays = []
+        for idx in range(num_frames):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx * (total - 1) // max(num_frames - 1, 1))
+            ok, frame = cap.read()
+            if not ok:
+                continue
+            gray = cv2.cvtColor(cv2.resize(frame, (64, 36)), cv2.COLOR_BGR2GRAY)
+            grays.append(gray.astype("int16"))
         cap.release()
-        return frame_count / fps if fps > 0 else 0.0
+        if len(grays) < 2:
+            return float("inf")
+        import numpy as np
+
+        return float(
+            np.mean([np.abs(a - b).mean() for a, b in zip(grays, grays[1:])])
+        )
     except Exception:
-        return 0.0
+        return float("inf")
 
 
 def frame_to_time(frame_idx: float, fps: float) -> float:
@@ -13,7 +13,6 @@ Usage:
 import argparse
 import asyncio
 import concurrent.futures
-import json
 import logging
 import os
 import re
@@ -25,13 +24,19 @@ from enum import Enum
 from pathlib import Path
 
 import aiohttp
+import orjson
 import requests
 from tqdm import tqdm
 
 from yp_video.config import load_prompt, load_vllm_env
 from yp_video.core.ffmpeg import FFmpegError, extract_clip, get_video_duration
+from yp_video.core.sampling import clip_motion_score
 
 _VLLM_CONFIG = load_vllm_env()
+# One keep-alive session for all sync HTTP to the vLLM server — a fresh
+# requests.post per clip pays TCP setup thousands of times per video.
+_SESSION = requests.Session()
+_SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
 # Two prompts: broadcast footage (the original) vs. amateur side-court
 # practice recordings (no replays/ads, but lots of drill activity that
 # isn't a real served rally). _select_prompt() picks based on which
@@ -40,6 +45,11 @@ _VLLM_CONFIG = load_vllm_env()
 BROADCAST_PROMPT = load_prompt("rally-seg-broadcast.txt")
 SIDELINE_PROMPT = load_prompt("rally-seg-sideline.txt")
 
+# Mean abs inter-frame diff (uint8 gray) below which a clip is treated as a
+# static card and answered without inference. True stills measure ≈0; quiet
+# game footage measures well above 5, so 1.0 only fires on genuine stills.
+STATIC_MOTION_THRESHOLD = 1.0
+
 
 def _select_prompt(video_path: str) -> str:
     """Pick prompt by which cuts dir the video is in."""
@@ -55,7 +65,7 @@ def check_server(server_url: str, retries: int = 5, backoff: float = 3.0) -> Non
     """Check if vLLM server is reachable, with retries and exponential backoff."""
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.get(f"{server_url}/v1/models", timeout=10)
+            resp = _SESSION.get(f"{server_url}/v1/models", timeout=10)
             resp.raise_for_status()
             return
         except requests.exceptions.RequestException as e:
@@ -95,26 +105,31 @@ class ClipResult:
 def extract_json_from_response(content: str) -> dict:
     """Extract JSON from LLM response, handling markdown code blocks.
 
+    With _RESPONSE_FORMAT constraining decoding, the content is bare JSON and
+    the first parse succeeds; the fence-stripping fallback covers servers
+    running without structured-output support.
+
     Args:
         content: Raw response content from LLM
 
     Returns:
         Parsed JSON dictionary, or fallback dict on parse failure
     """
-    # Try to extract JSON from markdown code blocks
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+
     json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", content)
     if json_match:
-        json_str = json_match.group(1).strip()
-    else:
-        json_str = content.strip()
-
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
-        return {
-            "in_rally": False,
-            "shot_type": ShotType.CLOSE_UP,
-        }
+        try:
+            return orjson.loads(json_match.group(1).strip())
+        except orjson.JSONDecodeError:
+            pass
+    return {
+        "in_rally": False,
+        "shot_type": ShotType.CLOSE_UP,
+    }
 
 
 def save_results(output_file: str, video_path: str, clip_duration: float,
@@ -125,10 +140,8 @@ def save_results(output_file: str, video_path: str, clip_duration: float,
         Line 1: metadata with _meta=true
         Line 2+: one clip result per line
     """
-    rally_clips = [r for r in results if r.in_rally]
-
     Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as f:
+    with open(output_file, "wb") as f:
         # First line: metadata
         meta = {
             "_meta": True,
@@ -136,19 +149,65 @@ def save_results(output_file: str, video_path: str, clip_duration: float,
             "clip_duration": clip_duration,
             "slide_interval": slide_interval,
             "total_clips": len(results),
-            "rally_clips": len(rally_clips),
+            "rally_clips": sum(1 for r in results if r.in_rally),
         }
-        f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+        f.write(orjson.dumps(meta) + b"\n")
 
-        # Subsequent lines: one result per line
+        # Subsequent lines: one result per line. orjson serializes the
+        # dataclass (str-enum shot_type included) in C — no per-field
+        # dict building.
         for r in results:
-            result_dict = {
-                "start_time": r.start_time,
-                "end_time": r.end_time,
-                "in_rally": r.in_rally,
-                "shot_type": r.shot_type.value,
-            }
-            f.write(json.dumps(result_dict, ensure_ascii=False) + "\n")
+            f.write(orjson.dumps(r) + b"\n")
+
+
+# Request parameters that never change across clips. Only the video URL,
+# prompt, model and fps vary; both the sync and async callers build their
+# payload here so the two paths cannot drift.
+# Constrained decoding: the model can only emit a ClipResult-shaped object,
+# so responses parse directly (no markdown fences) and waste no tokens on
+# prose around the JSON.
+_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "clip_result",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "in_rally": {"type": "boolean"},
+                "shot_type": {"type": "string", "enum": [s.value for s in ShotType]},
+            },
+            "required": ["in_rally", "shot_type"],
+        },
+    },
+}
+
+_PAYLOAD_STATIC = {
+    "max_tokens": 256,
+    "temperature": 0.1,
+    "chat_template_kwargs": {"enable_thinking": False},
+    "response_format": _RESPONSE_FORMAT,
+}
+
+
+def _build_payload(video_url: str, prompt: str, model: str, fps: float) -> dict:
+    # The prompt goes in the system turn, not after the video: the server runs
+    # --enable-prefix-caching, which reuses KV-cache only for a shared token
+    # PREFIX. With the prompt first, every clip after the first skips its
+    # prefill; trailing the video it is re-prefilled on every request.
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": prompt},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "video_url", "video_url": {"url": video_url}},
+                ],
+            },
+        ],
+        **_PAYLOAD_STATIC,
+        "mm_processor_kwargs": {"fps": fps},
+    }
 
 
 def analyze_clip_with_vllm(
@@ -160,46 +219,22 @@ def analyze_clip_with_vllm(
 ) -> dict:
     """Send video clip to vLLM server for analysis."""
 
-    # Use file:// URL for local files (requires --allowed-local-media-path on server)
-    video_url = f"file://{video_path}"
+    # Use file:// URL for local files (requires --allowed-local-media-path on
+    # server). realpath so a symlinked clip dir can't fail the allowlist check.
+    video_url = f"file://{os.path.realpath(video_path)}"
 
     if prompt is None:
         prompt = _select_prompt(video_path)
 
-    payload = {
-        "model": model,
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "video_url",
-                        "video_url": {
-                            "url": video_url
-                        }
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt
-                    }
-                ]
-            }
-        ],
-        "max_tokens": 256,
-        "temperature": 0.1,
-        "chat_template_kwargs": {"enable_thinking": False},
-        "mm_processor_kwargs": {"fps": fps}
-    }
-
-    response = requests.post(
+    response = _SESSION.post(
         f"{server_url}/v1/chat/completions",
-        json=payload,
+        data=orjson.dumps(_build_payload(video_url, prompt, model, fps)),
         headers={"Content-Type": "application/json"},
         timeout=120
     )
     response.raise_for_status()
 
-    result = response.json()
+    result = orjson.loads(response.content)
     content = result["choices"][0]["message"]["content"]
 
     return extract_json_from_response(content)
@@ -215,43 +250,22 @@ async def analyze_clip_async(
     prompt: str | None = None,
 ) -> dict:
     """Async version of analyze_clip_with_vllm with retry on transient errors."""
-    video_url = f"file://{video_path}"
+    video_url = f"file://{os.path.realpath(video_path)}"
 
     if prompt is None:
         prompt = _select_prompt(video_path)
 
-    payload = {
-        "model": model,
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "video_url",
-                        "video_url": {
-                            "url": video_url
-                        }
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt
-                    }
-                ]
-            }
-        ],
-        "max_tokens": 256,
-        "temperature": 0.1,
-        "chat_template_kwargs": {"enable_thinking": False},
-        "mm_processor_kwargs": {"fps": fps}
-    }
+    payload = orjson.dumps(_build_payload(video_url, prompt, model, fps))
 
     url = f"{server_url}/v1/chat/completions"
     last_error = None
     for attempt in range(1, max_retries + 1):
         try:
-            async with session.post(url, json=payload) as response:
+            async with session.post(
+                url, data=payload, headers={"Content-Type": "application/json"}
+            ) as response:
                 response.raise_for_status()
-                result = await response.json()
+                result = orjson.loads(await response.read())
                 content = result["choices"][0]["message"]["content"]
                 return extract_json_from_response(content)
         except (asyncio.TimeoutError, aiohttp.ServerTimeoutError, aiohttp.ServerDisconnectedError) as e:
@@ -265,14 +279,16 @@ async def analyze_clip_async(
     raise last_error
 
 
+# Value → member dispatch: called once per clip, and a dict miss is far
+# cheaper than constructing the enum and catching ValueError.
+_SHOT_TYPE_MAP = {s.value: s for s in ShotType}
+
+
 def _parse_shot_type(value: str | ShotType) -> ShotType:
     """Convert string to ShotType enum."""
     if isinstance(value, ShotType):
         return value
-    try:
-        return ShotType(value)
-    except ValueError:
-        return ShotType.FULL_COURT
+    return _SHOT_TYPE_MAP.get(value, ShotType.FULL_COURT)
 
 
 def process_single_clip(
@@ -342,22 +358,27 @@ def build_clip_specs(
 
     Single source of truth for clip windowing logic used by both
     count_clips() and process_video().
-    """
-    specs: list[tuple[int, float, float]] = []
-    current_time = 0.0
-    clip_index = 0
 
-    while current_time + clip_duration <= total_duration:
-        clip_index += 1
-        specs.append((clip_index, current_time, current_time + clip_duration))
-        current_time += slide_interval
+    Windows are computed in integer milliseconds — accumulating
+    ``current_time += slide_interval`` in floats drifts over a multi-hour
+    video, and every drifted start lands the ffmpeg seek a frame off.
+    """
+    slide_ms = round(slide_interval * 1000)
+    dur_ms = round(clip_duration * 1000)
+    total_ms = round(total_duration * 1000)
+    if slide_ms <= 0 or dur_ms <= 0:
+        return []
+
+    n = (total_ms - dur_ms) // slide_ms + 1 if total_ms >= dur_ms else 0
+    specs = [
+        (i + 1, i * slide_ms / 1000.0, (i * slide_ms + dur_ms) / 1000.0)
+        for i in range(n)
+    ]
 
     # Final partial clip if remaining time > slide_interval
-    remaining = total_duration - current_time
-    if remaining > slide_interval:
-        clip_index += 1
-        start_time = max(0, total_duration - clip_duration)
-        specs.append((clip_index, start_time, total_duration))
+    if total_ms - n * slide_ms > slide_ms:
+        start_ms = max(0, total_ms - dur_ms)
+        specs.append((n + 1, start_ms / 1000.0, total_ms / 1000.0))
 
     return specs
 
@@ -402,10 +423,26 @@ async def _run_pipeline_async(
 
     results_by_idx: dict[int, ClipResult] = {}
     state_lock = asyncio.Lock()
-    save_counter = 0
-    save_every = max(1, max_concurrent)
     fatal: list[BaseException] = []
 
+    # Append-only progress file: meta header once, then one line per completed
+    # clip in completion order (readers sort by start_time). The old periodic
+    # save rewrote the whole file, O(n²) bytes across a run; process_video
+    # still writes the canonical sorted file once at the end.
+    out_f = None
+    if output_file:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        out_f = open(output_file, "wb")
+        meta = {
+            "_meta": True,
+            "video": video_path,
+            "clip_duration": clip_duration,
+            "slide_interval": slide_interval,
+            "total_clips": len(clip_specs),
+        }
+        out_f.write(orjson.dumps(meta) + b"\n")
+        out_f.flush()
+
     async def producer():
         try:
             for idx, start_time, end_time in clip_specs:
@@ -429,7 +466,6 @@ async def _run_pipeline_async(
                 await extracted_q.put(SENTINEL)
 
     async def consumer():
-        nonlocal save_counter
         while True:
             item = await extracted_q.get()
             if item is SENTINEL:
@@ -445,10 +481,19 @@ async def _run_pipeline_async(
 
             analysis = None
             try:
-                analysis = await analyze_clip_async(
-                    session, clip_path, server_url, model, fps=fps,
-                    prompt=prompt,
-                )
+                # Static clips (scoreboard overlays, title cards between sets)
+                # are trivially no-rally: answer them from a cheap motion probe
+                # instead of spending a GPU request. The threshold is
+                # conservative — probe failure scores inf and still defers to
+                # the model.
+                motion = await loop.run_in_executor(None, clip_motion_score, clip_path)
+                if motion < STATIC_MOTION_THRESHOLD:
+                    analysis = {"in_rally": False, "shot_type": ShotType.CLOSE_UP}
+                else:
+                    analysis = await analyze_clip_async(
+                        session, clip_path, server_url, model, fps=fps,
+                        prompt=prompt,
+                    )
             except (aiohttp.ClientError, OSError) as e:
                 # TimeoutError after retries → drop this clip; other connection
                 # errors → server is down, abort the whole run.
@@ -472,26 +517,27 @@ async def _run_pipeline_async(
 
             async with state_lock:
                 if analysis is not None:
-                    results_by_idx[idx] = ClipResult(
+                    result = ClipResult(
                         start_time=start_time,
                         end_time=end_time,
                         in_rally=analysis.get("in_rally", False),
                         shot_type=_parse_shot_type(analysis.get("shot_type", "full_court")),
                     )
+                    results_by_idx[idx] = result
+                    if out_f is not None:
+                        out_f.write(orjson.dumps(result) + b"\n")
+                        out_f.flush()
                 pbar.update(1)
                 if on_progress:
                     on_progress(pbar.n, pbar.total)
 
-                save_counter += 1
-                if output_file and save_counter % save_every == 0:
-                    sorted_results = [results_by_idx[i] for i in sorted(results_by_idx)]
-                    save_results(output_file, video_path, clip_duration, slide_interval, sorted_results)
-
     consumers = [asyncio.create_task(consumer()) for _ in range(max_concurrent)]
     try:
         await asyncio.gather(producer(), *consumers)
     finally:
         extract_pool.shutdown(wait=True)
+        if out_f is not None:
+            out_f.close()
 
     if fatal:
         raise fatal[0]
@@ -555,7 +601,12 @@ def process_video(
     async def _create_session():
         connector = aiohttp.TCPConnector(limit=max_concurrent)
         return aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=120), connector=connector
+            timeout=aiohttp.ClientTimeout(total=120),
+            connector=connector,
+            # aiohttp's default 64 KB read buffer can backpressure the server
+            # when it flushes a response in many small chunks; completions are
+            # short, but the buffer is cheap insurance at this concurrency.
+            read_bufsize=4 * 1024 * 1024,
         )
 
     session = loop.run_until_complete(_create_session())
@@ -595,8 +646,8 @@ def process_video(
             finally:
                 pbar.close()
 
-            # Final save (the periodic save inside the pipeline may have missed
-            # the tail when total_clips % save_every != 0)
+            # Final save: the in-run file is append-only in completion order;
+            # this pass writes the canonical time-sorted file.
             if output_file and results:
                 save_results(output_file, video_path, clip_duration, slide_interval, results)
     finally:
@@ -16,12 +16,16 @@ Rally detection logic:
 """
 
 import argparse
+import concurrent.futures
+import os
 from pathlib import Path
 
+import numpy as np
+
 from yp_video.config import RALLY_PRE_ANNOTATIONS_DIR, SEG_ANNOTATIONS_DIR
+from yp_video.core.ffmpeg import get_video_duration
 from yp_video.core.jsonl import read_jsonl, write_jsonl
 from yp_video.core.rallies import number_rallies
-from yp_video.core.sampling import get_video_duration_cv2 as get_video_duration
 
 
 def detect_rallies(
@@ -57,49 +61,61 @@ def detect_rallies(
     if not clips:
         return []
 
-    clips_sorted = sorted(clips, key=lambda x: x["start_time"])
-
-    # Build time slots at slide_interval resolution
-    t_min = clips_sorted[0]["start_time"]
-    t_max = max(c["end_time"] for c in clips_sorted)
-
-    slot_times: list[float] = []
-    t = t_min
-    while t < t_max:
-        slot_times.append(t)
-        t += slide_interval
-
-    if not slot_times:
+    starts = np.array([c["start_time"] for c in clips], dtype=np.float64)
+    ends = np.array([c["end_time"] for c in clips], dtype=np.float64)
+    is_rally = np.array([bool(c.get("in_rally", False)) for c in clips])
+    if require_full_court:
+        is_rally &= np.array([c.get("shot_type") == "full_court" for c in clips])
+
+    # Build time slots at slide_interval resolution. Multiplying out from
+    # t_min (rather than accumulating t += slide_interval) keeps slot times
+    # drift-free over multi-hour videos.
+    t_min = float(starts.min())
+    t_max = float(ends.max())
+    n_slots = int(np.ceil((t_max - t_min) / slide_interval))
+    if n_slots <= 0:
         return []
+    slot_times = t_min + slide_interval * np.arange(n_slots)
+
+    # Raw rally score per slot (ratio of rally clips among covering clips),
+    # via one broadcast membership mask — the per-slot Python scan over all
+    # clips was O(slots × clips) in the interpreter.
+    covers = (starts <= slot_times[:, None]) & (slot_times[:, None] < ends)
+    total_votes = covers.sum(axis=1)
+    rally_votes = (covers & is_rally).sum(axis=1)
+    raw_scores = np.divide(
+        rally_votes, total_votes,
+        out=np.zeros(n_slots), where=total_votes > 0,
+    )
 
-    # Compute raw rally score per slot (ratio of rally clips among covering clips)
-    raw_scores: list[float] = []
-    for t in slot_times:
-        rally_votes = 0
-        total_votes = 0
-        for c in clips_sorted:
-            if c["start_time"] <= t < c["end_time"]:
-                total_votes += 1
-                is_rally = c.get("in_rally", False)
-                if require_full_court:
-                    is_rally = is_rally and c.get("shot_type") == "full_court"
-                if is_rally:
-                    rally_votes += 1
-        raw_scores.append(rally_votes / total_votes if total_votes > 0 else 0.0)
-
-    # Smooth with 3-slot moving average
-    n = len(raw_scores)
-    smoothed = []
-    for i in range(n):
-        window = raw_scores[max(0, i - 1) : i + 2]
-        smoothed.append(sum(window) / len(window))
+    # Smooth with a 3-slot moving average; edge slots average their 2-slot
+    # window, matching the old list-slice behavior. Interior windows must
+    # also add left-to-right exactly like the old sum() did: raw scores are
+    # small ratios (halves, thirds), so window means routinely land exactly
+    # on the 0.5 threshold, and a different association order can come out
+    # one ulp low and flip the comparison — splitting or dropping a rally.
+    # Edge windows have two terms, where addition order cannot matter.
+    sums = raw_scores.copy()
+    if n_slots > 1:
+        sums[0] += raw_scores[1]
+        sums[-1] += raw_scores[-2]
+    if n_slots > 2:
+        sums[1:-1] = (raw_scores[:-2] + raw_scores[1:-1]) + raw_scores[2:]
+    counts = np.full(n_slots, 3.0)
+    counts[0] = min(2, n_slots)
+    counts[-1] = min(2, n_slots)
+    if n_slots == 1:
+        counts[0] = 1.0
+    smoothed = sums / counts
 
     # Threshold to get binary rally signal, then merge consecutive rally slots
     rallies: list[dict] = []
     current_start: float | None = None
     current_end: float = 0.0
 
-    for t, score in zip(slot_times, smoothed):
+    # .tolist() back to Python floats — the rally dicts feed orjson, which
+    # does not serialize numpy scalars.
+    for t, score in zip(slot_times.tolist(), smoothed.tolist()):
         if score >= min_score:
             if current_start is None:
                 current_start = t
@@ -146,7 +162,14 @@ def convert_vlm_to_rally(
     # Get video path and duration
     video_path = Path(meta.get("video", ""))
     if video_path.exists():
-        duration = get_video_duration(video_path)
+        try:
+            duration = get_video_duration(video_path)
+        except (ValueError, OSError):
+            # ffprobe found the file but couldn't report a duration
+            # (corrupt/truncated video). One bad file must not abort the
+            # whole directory batch via future.result(), so fall back to
+            # the clip-derived estimate like the missing-file branch.
+            duration = max(c.get("end_time", 0) for c in clips)
     else:
         # Estimate from clips
         duration = max(c.get("end_time", 0) for c in clips)
@@ -173,14 +196,14 @@ def convert_directory(
     min_score: float = 0.5,
 ):
     """Convert all VLM JSONL files in a directory."""
-    jsonl_files = sorted(input_dir.glob("*.jsonl"))
-
-    # Filter out files that are already rally annotations
-    vlm_files = []
-    for f in jsonl_files:
-        if "_annotations" in f.stem:
-            continue  # Skip already converted files
-        vlm_files.append(f)
+    # scandir: one readdir pass, no per-entry stat or Path construction for
+    # the names we drop ("_annotations" = already-converted outputs).
+    with os.scandir(input_dir) as entries:
+        vlm_files = sorted(
+            Path(e.path)
+            for e in entries
+            if e.name.endswith(".jsonl") and "_annotations" not in e.name
+        )
 
     if not vlm_files:
         print(f"No VLM detection files found in {input_dir}")
@@ -188,14 +211,25 @@ def convert_directory(
 
     print(f"Found {len(vlm_files)} VLM detection files")
 
+    # Each file is independent; the time goes to ffprobe subprocesses and
+    # file I/O, both of which release the GIL — threads parallelize them
+    # without ProcessPool pickling. Results print in as-completed order.
     total_rallies = 0
-    for vlm_path in vlm_files:
-        output_name = f"{vlm_path.stem}_annotations.jsonl"
-        output_path = output_dir / output_name
-
-        n_rallies = convert_vlm_to_rally(vlm_path, output_path, min_duration, min_score)
-        total_rallies += n_rallies
-        print(f"  {vlm_path.name}: {n_rallies} rallies")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {
+            pool.submit(
+                convert_vlm_to_rally,
+                vlm_path,
+                output_dir / f"{vlm_path.stem}_annotations.jsonl",
+                min_duration,
+                min_score,
+            ): vlm_path
+            for vlm_path in vlm_files
+        }
+        for future in concurrent.futures.as_completed(futures):
+            n_rallies = future.result()
+            total_rallies += n_rallies
+            print(f"  {futures[future].name}: {n_rallies} rallies")
 
     print(f"\nTotal: {total_rallies} rallies from {len(vlm_files)} videos")
 
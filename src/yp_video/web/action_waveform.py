@@ -17,7 +17,7 @@ from yp_video.config import ACTION_WAVEFORMS_DIR
 from yp_video.core.ffmpeg import (
     FFmpegError,
     parse_optional_float,
-    probe_video_metadata,
+    probe_video_metadata_cached,
 )
 
 log = logging.getLogger(__name__)
@@ -28,9 +28,12 @@ AUDIO_WAVEFORM_CACHE_VERSION = 7
 
 
 def video_metadata(path: Path) -> dict:
-    """Probe ``{fps, duration, num_frames, start_time}``; HTTP 502 on failure."""
+    """Probe ``{fps, duration, num_frames, start_time}``; HTTP 502 on failure.
+
+    Cached on the video's mtime — the UI re-asks on every page load.
+    """
     try:
-        return probe_video_metadata(path)
+        return probe_video_metadata_cached(path)
     except FFmpegError as exc:
         raise HTTPException(502, str(exc)) from exc
 
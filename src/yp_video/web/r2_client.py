@@ -260,7 +260,9 @@ def serve_video_or_r2_redirect(
     Returns a FastAPI response if the file is found on R2 or locally,
     or None if not found anywhere.
     """
-    from fastapi.responses import FileResponse, RedirectResponse
+    from fastapi.responses import RedirectResponse
+
+    from yp_video.web.responses import VideoFileResponse
 
     # Prefer R2 presigned URL — video is served directly from the edge.
     # 24h expiry: a <video> element holds one URL for the whole labeling
@@ -272,9 +274,10 @@ def serve_video_or_r2_redirect(
                 url = r2_client.generate_presigned_url(r2_key, expires=24 * 3600)
                 return RedirectResponse(url)
 
-    # Fallback: serve from local disk
-    if local_path.exists() and local_path.is_file():
-        return FileResponse(local_path, media_type="video/mp4")
+    # Fallback: serve from local disk. VideoFileResponse uses the server's
+    # sendfile() fast path for whole-file sends on multi-GB videos.
+    if local_path.is_file():
+        return VideoFileResponse(local_path, media_type="video/mp4")
     return None
 
 
@@ -0,0 +1,52 @@
+"""Response types shared by the video-serving endpoints."""
+
+import os
+import stat
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+
+class VideoFileResponse(FileResponse):
+    """FileResponse that hands whole-file sends to the server via pathsend.
+
+    Starlette's chunked send dispatches an event-loop callback per 64 KB
+    chunk, which is pure dispatch overhead for a multi-GB match video. When
+    the ASGI server advertises the ``http.response.pathsend`` extension
+    (uvicorn does), send the headers once and let the server ``sendfile()``
+    the bytes kernel-to-socket.
+
+    Range requests — every seek a <video> element makes — still take the
+    inherited chunked path, because pathsend cannot slice a file.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        use_pathsend = (
+            scope["method"].upper() == "GET"
+            and "http.response.pathsend" in scope.get("extensions", {})
+            and Headers(scope=scope).get("range") is None
+        )
+        if not use_pathsend:
+            await super().__call__(scope, receive, send)
+            return
+
+        if self.stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.set_stat_headers(stat_result)
+
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+
+        if self.background is not None:
+            await self.background()
@@ -2,7 +2,6 @@
 
 import asyncio
 import io
-import json
 import logging
 import os
 import shutil
@@ -11,6 +10,7 @@ import zipfile
 from pathlib import Path
 from urllib.parse import unquote
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse, Response
 from pydantic import Field
@@ -82,13 +82,36 @@ def _read_jsonl_as_dict(path: Path) -> dict:
     return meta
 
 
-@router.get("/results")
-def list_results() -> list[dict]:
+# Local scan cache for /results: (per-source dir mtime_ns tuple) -> the
+# name->tags map. A landed or deleted file bumps its directory's mtime, so
+# the key changes exactly when the listing would. kind/done flags are NOT
+# cached — they live in other directories with their own lifetimes.
+_scan_cache: tuple[tuple[int | None, ...], dict[str, set[str]]] | None = None
+
+
+def _scan_local_results() -> dict[str, set[str]]:
+    global _scan_cache
+    key = tuple(
+        source.directory.stat().st_mtime_ns if source.directory.exists() else None
+        for source in _SOURCES
+    )
+    if _scan_cache is not None and _scan_cache[0] == key:
+        return _scan_cache[1]
     files: dict[str, set[str]] = {}  # name -> set of source tags
     for source in _SOURCES:
         if source.directory.exists():
-            for f in source.directory.glob("*.jsonl"):
-                files.setdefault(f.name, set()).add(source.tag)
+            with os.scandir(source.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".jsonl") and entry.is_file():
+                        files.setdefault(entry.name, set()).add(source.tag)
+    _scan_cache = (key, files)
+    return files
+
+
+@router.get("/results")
+def list_results() -> list[dict]:
+    # Copy-of-sets so the R2 merge below never mutates the cached map.
+    files = {name: set(tags) for name, tags in _scan_local_results().items()}
     # Include R2-only files
     if r2_client.configured:
         try:
@@ -117,6 +140,17 @@ def list_results() -> list[dict]:
     )
 
 
+def _validated_name(name: str) -> str:
+    """Reject path traversal in one normpath + separator check.
+
+    Result names are bare filenames; anything that normalizes differently
+    or carries a separator is trying to walk out of the source dirs.
+    """
+    if os.path.normpath(name) != name or os.sep in name or name in (".", ".."):
+        raise HTTPException(400, f"Invalid result name: {name!r}")
+    return name
+
+
 class DoneRequest(StrictModel):
     done: bool = True
 
@@ -136,19 +170,23 @@ async def get_result(name: str, source: str | None = None) -> dict:
     location — used by the Load UI to open e.g. the VLM pass even when a SPOT
     pass or a saved annotation also exists.
     """
+    name = _validated_name(unquote(name))
     if source is not None and source not in _SOURCE_BY_TAG:
         raise HTTPException(
             400, f"Unknown source {source!r}; expected one of {[s.tag for s in _SOURCES]}"
         )
     candidates = (_SOURCE_BY_TAG[source],) if source else _SOURCES
 
-    # Try local files first
+    # Try local files first. is_file() alone — exists() before it was a
+    # second stat for the same answer on every candidate dir.
     for candidate in candidates:
         path = candidate.directory / name
-        if path.exists() and path.is_file():
+        if path.is_file():
             try:
-                data = _read_jsonl_as_dict(path)
-            except json.JSONDecodeError:
+                # Parse off the event loop — a tracks-sized jsonl takes long
+                # enough to stall every other in-flight request.
+                data = await asyncio.to_thread(_read_jsonl_as_dict, path)
+            except orjson.JSONDecodeError:
                 raise HTTPException(400, "Invalid JSONL file")
             # The tag, not the r2_category path — this is the value the
             # editor's Source select and loaded-source badge speak.
@@ -165,7 +203,7 @@ async def get_result(name: str, source: str | None = None) -> dict:
                 candidate.directory.mkdir(parents=True, exist_ok=True)
                 local_path = candidate.directory / name
                 await asyncio.to_thread(r2_client.download_file, r2_key, local_path)
-                data = _read_jsonl_as_dict(local_path)
+                data = await asyncio.to_thread(_read_jsonl_as_dict, local_path)
                 data["source"] = candidate.r2_category
                 return data
 
@@ -180,6 +218,10 @@ def stream_video(path: str):
     if decoded_path.startswith("/"):
         video_path = Path(decoded_path)
     else:
+        # A relative path must stay inside the videos tree — one normpath
+        # catches ../ escapes before any dir is probed.
+        if os.path.normpath(decoded_path).startswith(".."):
+            raise HTTPException(400, f"Invalid video path: {decoded_path!r}")
         # Try the split cut dirs first (the common case for annotations
         # produced by the detect → review pipeline), then VIDEOS_DIR for
         # historical paths, then raw-videos as a final fallback.
@@ -235,25 +277,21 @@ def _write_annotations_atomic(
         if assigned is None:
             high += 1
             assigned = high
-        rows.append(
-            {
-                "start": a.start,
-                "end": a.end,
-                "label": a.label,
-                "rally_id": assigned,
-            }
-        )
+        # model_dump builds the dict in pydantic-core (Rust) — id/rally_id
+        # are excluded because the minted id is assigned here, not taken
+        # from the request.
+        row = a.model_dump(exclude={"id", "rally_id"})
+        row["rally_id"] = assigned
+        rows.append(row)
     tmp_path = output_path.with_suffix(output_path.suffix + f".tmp.{os.getpid()}")
-    with open(tmp_path, "w", encoding="utf-8") as f:
+    with open(tmp_path, "wb") as f:
         meta = {
             "_meta": True,
             "video": video,
             "duration": duration,
             "max_rally_id": high,
         }
-        f.write(json.dumps(meta, ensure_ascii=False) + "\n")
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        f.write(b"\n".join(orjson.dumps(obj) for obj in (meta, *rows)) + b"\n")
         f.flush()
         os.fsync(f.fileno())
     os.replace(tmp_path, output_path)
@@ -1,6 +1,7 @@
 """Video cutter router."""
 
 import asyncio
+import os
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -43,7 +44,9 @@ class ExportResult(BaseModel):
 def list_videos() -> list[str]:
     if not RAW_VIDEOS_DIR.exists():
         return []
-    return sorted(f.name for f in RAW_VIDEOS_DIR.glob("*.mp4"))
+    # os.scandir: no Path object per file, dirent type comes for free.
+    with os.scandir(RAW_VIDEOS_DIR) as entries:
+        return sorted(e.name for e in entries if e.name.endswith(".mp4") and e.is_file())
 
 
 @router.get("/video/{name}")
@@ -83,10 +86,7 @@ async def export_segments(req: ExportRequest) -> ExportResult:
 
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    success = []
-    failed = []
-
-    for seg in req.segments:
+    async def export_one(seg: Segment) -> tuple[str, bool]:
         output_name = f"{seg.name}.mp4"
         output_path = target_dir / output_name
 
@@ -95,9 +95,16 @@ async def export_segments(req: ExportRequest) -> ExportResult:
         async with _EXPORT_SEMAPHORE:
             try:
                 await export_segment(source_path, seg.start, seg.end, output_path, copy=True)
-                sync_to_r2(output_path, r2_category)
-                success.append(output_name)
             except FFmpegError:
-                failed.append(output_name)
-
-    return ExportResult(success=success, failed=failed)
+                return output_name, False
+        sync_to_r2(output_path, r2_category)
+        return output_name, True
+
+    # Segments are independent — run them concurrently up to the global
+    # semaphore's cap instead of one at a time per request.
+    outcomes = await asyncio.gather(*(export_one(seg) for seg in req.segments))
+
+    return ExportResult(
+        success=[name for name, ok in outcomes if ok],
+        failed=[name for name, ok in outcomes if not ok],
+    )
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException
 from yp_video.config import (
     RALLY_PRE_ANNOTATIONS_DIR,
     SEG_ANNOTATIONS_DIR,
+    count_files,
     find_cut,
     load_vllm_env,
 )
@@ -199,6 +200,6 @@ async def convert_to_rally(req: ConvertRequest):
     sync_directory_to_r2(RALLY_PRE_ANNOTATIONS_DIR, "rally/pre-annotations")
 
     # Count output files
-    count = len(list(RALLY_PRE_ANNOTATIONS_DIR.glob("*.jsonl"))) if RALLY_PRE_ANNOTATIONS_DIR.exists() else 0
+    count = count_files(RALLY_PRE_ANNOTATIONS_DIR, "*.jsonl")
     return {"ok": True, "count": count}
 
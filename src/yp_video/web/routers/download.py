@@ -1,13 +1,14 @@
 """YouTube playlist downloader router."""
 
 import asyncio
-import json
 import logging
+import time
 import uuid
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
+import orjson
 import yt_dlp
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
@@ -17,6 +18,7 @@ from yp_video.config import RAW_VIDEOS_DIR
 from yp_video.web.job_helpers import batch_message, finalize_batch_job
 from yp_video.web.jobs import JobType, job_manager, threadsafe_update
 from yp_video.web.schemas import StrictModel
+from yp_video.youtube.download import get_format_string
 
 log = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,6 +31,29 @@ download_sessions: dict[str, dict[str, Any]] = {}
 # simultaneous downloads also saturate the VM's outbound bandwidth.
 _DOWNLOAD_SEMAPHORE = asyncio.Semaphore(2)
 
+# Cap on buffered session events. If the SSE reader disconnects (or never
+# connects), an unbounded queue grows for the whole download; 256 is plenty
+# of headroom for any reader that is actually keeping up.
+_QUEUE_MAXSIZE = 256
+
+
+def _put_dropping(queue: asyncio.Queue, msg: dict) -> None:
+    """Enqueue without ever blocking; evict the oldest item when full.
+
+    Progress events are already coalesced upstream, so dropping the stalest
+    one loses nothing a live reader would miss — and a download must never
+    stall because nobody is reading its queue.
+    """
+    while True:
+        try:
+            queue.put_nowait(msg)
+            return
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+
 
 class VideoInfo(BaseModel):
     id: str
@@ -51,13 +76,6 @@ class DownloadResponse(BaseModel):
     session_id: str
 
 
-def get_format_string(quality: str) -> str:
-    if quality == "best":
-        return "bestvideo[vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best"
-    else:
-        return f"bestvideo[height<={quality}][vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[height<={quality}][ext=mp4]+bestaudio[ext=m4a]/best[height<={quality}]"
-
-
 def normalize_playlist_url(url: str) -> str:
     parsed = urlparse(url)
     query = parse_qs(parsed.query)
@@ -72,7 +90,12 @@ async def get_playlist(url: str) -> PlaylistInfo:
     normalized_url = normalize_playlist_url(url)
 
     ydl_opts = {
-        "extract_flat": True,
+        # "in_playlist" (not the legacy True) — entries stay flat but a bare
+        # video URL still resolves fully, which the single-video branch needs.
+        "extract_flat": "in_playlist",
+        # A wedged YouTube connection should fail the probe, not pin an
+        # executor thread until the default OS timeout.
+        "socket_timeout": 10,
         "quiet": True,
         "no_warnings": True,
     }
@@ -128,7 +151,7 @@ async def start_download(req: DownloadRequest) -> DownloadResponse:
     download_sessions[session_id] = {
         "videos": req.videos,
         "quality": req.quality,
-        "queue": asyncio.Queue(),
+        "queue": asyncio.Queue(maxsize=_QUEUE_MAXSIZE),
         "cancelled": False,
         "task": None,
         "job_id": job.id,
@@ -156,6 +179,19 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
     failed = 0
     RAW_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
+    # Everything but progress_hooks is fixed for the session — build it once
+    # instead of re-deriving format strings and paths per video.
+    base_opts = {
+        "format": get_format_string(quality),
+        "merge_output_format": "mp4",
+        "outtmpl": str(RAW_VIDEOS_DIR / "%(title)s.%(ext)s"),
+        "postprocessor_args": {"ffmpeg": ["-movflags", "+faststart"]},
+        "cookiefile": str(Path.home() / "cookies.txt"),
+        "js_runtimes": {"node": {}},
+        "quiet": True,
+        "no_warnings": True,
+    }
+
     if job_id:
         await job_manager.update_job(
             job_id, status="running",
@@ -165,7 +201,7 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
     try:
         for i, video in enumerate(videos):
             if session.get("cancelled"):
-                await queue.put({"type": "cancelled"})
+                _put_dropping(queue, {"type": "cancelled"})
                 if job_id:
                     await job_manager.update_job(job_id, status="cancelled")
                 return
@@ -178,7 +214,7 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
                     progress=base_progress,
                     message=batch_message(i, total, video.title),
                 )
-            await queue.put({
+            _put_dropping(queue, {
                 "type": "start",
                 "video_id": video_id,
                 "title": video.title,
@@ -187,10 +223,14 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
             })
 
             def make_progress_hook(vid_id: str, q: asyncio.Queue, loop, idx: int):
-                # Throttle Job updates so a multi-megabyte file doesn't fire
-                # hundreds of SSE events per second; the in-session queue still
-                # gets every update for the Download page's byte-level UI.
+                # Two throttles: Job updates at 1 Hz (the Jobs page polls
+                # coarsely) and session-queue events at 10 Hz / whole-percent
+                # crossings — yt-dlp ticks per chunk, and nobody can read
+                # hundreds of SSE frames per second. finished/complete events
+                # always go through.
                 last_pushed = [0.0]
+                last_put = [0.0]
+                last_percent = [-1.0]
                 update = threadsafe_update(job_id, loop) if job_id else None
                 def hook(d):
                     if d["status"] == "downloading":
@@ -200,8 +240,14 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
                         eta = d.get("eta", 0)
                         percent = (downloaded / total_b * 100) if total_b > 0 else 0
 
-                        asyncio.run_coroutine_threadsafe(
-                            q.put({
+                        now = time.monotonic()
+                        if now - last_put[0] >= 0.1 or int(percent) != int(last_percent[0]):
+                            last_put[0] = now
+                            last_percent[0] = percent
+                            # call_soon_threadsafe, not run_coroutine_threadsafe:
+                            # _put_dropping never awaits, so there is no
+                            # coroutine (or Future round-trip) to schedule.
+                            loop.call_soon_threadsafe(_put_dropping, q, {
                                 "type": "progress",
                                 "video_id": vid_id,
                                 "percent": percent,
@@ -209,12 +255,8 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
                                 "total": total_b,
                                 "speed": speed,
                                 "eta": eta,
-                            }),
-                            loop,
-                        )
+                            })
                         if update is not None:
-                            import time as _time
-                            now = _time.monotonic()
                             if now - last_pushed[0] >= 1.0:
                                 last_pushed[0] = now
                                 # Sub-progress within the current video, scaled
@@ -230,27 +272,17 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
                                     message=batch_message(idx, total, video.title, detail),
                                 )
                     elif d["status"] == "finished":
-                        asyncio.run_coroutine_threadsafe(
-                            q.put({
-                                "type": "finished",
-                                "video_id": vid_id,
-                                "filename": d.get("filename", ""),
-                            }),
-                            loop,
-                        )
+                        loop.call_soon_threadsafe(_put_dropping, q, {
+                            "type": "finished",
+                            "video_id": vid_id,
+                            "filename": d.get("filename", ""),
+                        })
                 return hook
 
             loop = asyncio.get_event_loop()
             ydl_opts = {
-                "format": get_format_string(quality),
-                "merge_output_format": "mp4",
-                "outtmpl": str(RAW_VIDEOS_DIR / "%(title)s.%(ext)s"),
+                **base_opts,
                 "progress_hooks": [make_progress_hook(video_id, queue, loop, i)],
-                "postprocessor_args": {"ffmpeg": ["-movflags", "+faststart"]},
-                "cookiefile": str(Path.home() / "cookies.txt"),
-                "js_runtimes": {"node": {}},
-                "quiet": True,
-                "no_warnings": True,
             }
 
             try:
@@ -260,14 +292,14 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
                     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                         await loop.run_in_executor(None, ydl.download, [video.url])
 
-                await queue.put({"type": "complete", "video_id": video_id})
+                _put_dropping(queue, {"type": "complete", "video_id": video_id})
             except asyncio.CancelledError:
                 raise
             except Exception as e:
                 failed += 1
-                await queue.put({"type": "error", "video_id": video_id, "error": str(e)})
+                _put_dropping(queue, {"type": "error", "video_id": video_id, "error": str(e)})
 
-        await queue.put({"type": "done"})
+        _put_dropping(queue, {"type": "done"})
         if job_id:
             await finalize_batch_job(job_id, total, failed, noun="downloads")
     except asyncio.CancelledError:
@@ -275,10 +307,7 @@ async def download_videos(session_id: str, videos: list[VideoInfo], quality: str
         # Mirror the cancellation back into the session queue so the
         # download page UI also reacts, then mark the Job cancelled.
         session["cancelled"] = True
-        try:
-            await queue.put({"type": "cancelled"})
-        except Exception:  # noqa: BLE001 — SSE reader may already be gone
-            log.warning("Could not mirror cancellation into download session queue")
+        _put_dropping(queue, {"type": "cancelled"})
         raise
 
 
@@ -293,13 +322,15 @@ async def get_progress(session_id: str):
         while True:
             try:
                 msg = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield f"data: {json.dumps(msg)}\n\n"
+                # orjson bytes straight into the SSE frame — progress events
+                # arrive continuously for the whole download.
+                yield b"data: " + orjson.dumps(msg) + b"\n\n"
                 if msg["type"] in ("done", "cancelled"):
                     if session_id in download_sessions:
                         del download_sessions[session_id]
                     break
             except asyncio.TimeoutError:
-                yield "data: {}\n\n"
+                yield b"data: {}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -11,30 +11,31 @@ Usage:
 """
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
+import yt_dlp
+
 from yp_video.config import VIDEOS_DIR as DEFAULT_OUTPUT_DIR
 
 
-def check_ytdlp():
-    """Check if yt-dlp is installed."""
-    try:
-        result = subprocess.run(
-            ["yt-dlp", "--version"],
-            capture_output=True,
-            text=True
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+def get_format_string(quality: str) -> str:
+    """yt-dlp format selector for a quality cap.
+
+    H.264 (avc1) + AAC preferred for maximum playback compatibility
+    (Mac/Linux/Windows/VSCode). Shared with the web download router.
+    """
+    if quality == "best":
+        return "bestvideo[vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best"
+    else:
+        return f"bestvideo[height<={quality}][vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[height<={quality}][ext=mp4]+bestaudio[ext=m4a]/best[height<={quality}]"
 
 
-def install_ytdlp():
-    """Install yt-dlp using pip."""
-    print("Installing yt-dlp...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "yt-dlp"])
+def _base_opts() -> dict:
+    return {
+        "cookiefile": str(Path.home() / "cookies.txt"),
+        "js_runtimes": {"node": {}},
+    }
 
 
 def download_video(
@@ -48,6 +49,9 @@ def download_video(
     """
     Download YouTube video with audio.
 
+    Runs yt-dlp in-process — we already import it as a library, so there is
+    no yt-dlp subprocess (and its ~1-2 s interpreter startup) per call.
+
     Args:
         url: YouTube URL
         output_dir: Output directory (default: ~/videos)
@@ -65,61 +69,48 @@ def download_video(
     output_dir = Path(output_dir).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    output_template = str(output_dir / filename_template)
-
-    cmd = ["yt-dlp", "--cookies", str(Path.home() / "cookies.txt"), "--js-runtimes", "node"]
+    ydl_opts = {
+        **_base_opts(),
+        "outtmpl": str(output_dir / filename_template),
+        "noplaylist": True,
+    }
 
     if audio_only:
         # Best audio only, convert to mp3
-        cmd.extend([
-            "-f", "bestaudio",
-            "-x",  # Extract audio
-            "--audio-format", "mp3",
-            "--audio-quality", "0",  # Best quality
-        ])
+        ydl_opts.update({
+            "format": "bestaudio",
+            "postprocessors": [{
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "0",  # Best quality
+            }],
+        })
     elif format_id:
         # Use specific format
-        cmd.extend(["-f", format_id])
+        ydl_opts["format"] = format_id
     else:
-        # Video + audio merged
-        # Use H.264 (avc1) + AAC for maximum compatibility (Mac/Linux/Windows/VSCode)
-        if quality == "best":
-            cmd.extend([
-                "-f", "bestvideo[vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-                "--merge-output-format", "mp4",
-            ])
-        else:
-            cmd.extend([
-                "-f", f"bestvideo[height<={quality}][vcodec^=avc1]+bestaudio[acodec^=mp4a]/bestvideo[height<={quality}][ext=mp4]+bestaudio[ext=m4a]/best[height<={quality}]",
-                "--merge-output-format", "mp4",
-            ])
-
-        # Add faststart for streaming compatibility
-        cmd.extend([
-            "--ppa", "ffmpeg:-movflags +faststart",
-        ])
-
-    cmd.extend([
-        "-o", output_template,
-        "--no-playlist",  # Download single video, not playlist
-        "--progress",
-        url
-    ])
+        ydl_opts.update({
+            "format": get_format_string(quality),
+            "merge_output_format": "mp4",
+            # faststart for streaming compatibility
+            "postprocessor_args": {"ffmpeg": ["-movflags", "+faststart"]},
+        })
 
     print(f"Downloading: {url}")
     print(f"Output: {output_dir}")
     print(f"Quality: {'audio only' if audio_only else quality}")
     print("-" * 50)
 
-    result = subprocess.run(cmd)
-
-    if result.returncode == 0:
-        print("\nDownload complete!")
-        return str(output_dir)
-    else:
-        print(f"\nDownload failed with code {result.returncode}")
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.download([url])
+    except yt_dlp.DownloadError as e:
+        print(f"\nDownload failed: {e}")
         return None
 
+    print("\nDownload complete!")
+    return str(output_dir)
+
 
 def download_youtube_video(url: str, output_dir: str | Path | None = None, quality: str = "best") -> str | None:
     """Convenience function for pipeline use.
@@ -132,31 +123,24 @@ def download_youtube_video(url: str, output_dir: str | Path | None = None, quali
     Returns:
         Path to output directory, or None if failed
     """
-    # Ensure yt-dlp is available
-    if not check_ytdlp():
-        install_ytdlp()
-        if not check_ytdlp():
-            print("Error: Failed to install yt-dlp")
-            return None
-
     return download_video(url=url, output_dir=output_dir, quality=quality)
 
 
 def list_formats(url: str):
     """List available formats for a video."""
-    subprocess.run(["yt-dlp", "-F", url])
+    with yt_dlp.YoutubeDL({**_base_opts(), "listformats": True}) as ydl:
+        ydl.extract_info(url, download=False)
 
 
 def get_video_info(url: str):
     """Get video information."""
-    subprocess.run([
-        "yt-dlp",
-        "--print", "title",
-        "--print", "duration_string",
-        "--print", "upload_date",
-        "--print", "channel",
-        url
-    ])
+    with yt_dlp.YoutubeDL({**_base_opts(), "quiet": True, "no_warnings": True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if info is None:
+        print("Could not fetch video info")
+        return
+    for key in ("title", "duration_string", "upload_date", "channel"):
+        print(info.get(key, ""))
 
 
 def main():
@@ -216,13 +200,6 @@ Examples:
 
     args = parser.parse_args()
 
-    # Check/install yt-dlp
-    if not check_ytdlp():
-        install_ytdlp()
-        if not check_ytdlp():
-            print("Error: Failed to install yt-dlp")
-            sys.exit(1)
-
     # Handle different modes
     if args.list:
         list_formats(args.url)
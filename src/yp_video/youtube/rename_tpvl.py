@@ -13,6 +13,7 @@ Usage:
 """
 
 import argparse
+import os
 import re
 import sys
 from pathlib import Path
@@ -25,6 +26,19 @@ FORMATTED_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}_G\d+_.+\.mp4$')
 # Pattern to match TPVL files
 TPVL_PATTERN = re.compile(r'TPVL\s+(\d{4})-(\d{2})')
 
+# The remaining per-field patterns, compiled once. Kept as separate scans
+# rather than one fused regex — upload titles vary too much for a single
+# pattern to stay readable, and each field failing independently gives the
+# same None-result behavior.
+GAME_PATTERN = re.compile(r'G(\d+)')
+# Handle both regular slash (/) and big solidus (⧸) Unicode character
+DATE_PATTERN = re.compile(r'(\d{1,2})[/⧸](\d{1,2})')
+# Teams follow the time; both colon (:) and underscore (_) appear as separator
+TEAMS_PATTERN = re.compile(r'\d{1,2}[_:]\d{2}\s+(.+?)(?:\.mp4|$)', re.IGNORECASE)
+VS_SPLIT = re.compile(r'\s+vs\.?\s+', re.IGNORECASE)
+MP4_SUFFIX = re.compile(r'\.mp4$', re.IGNORECASE)
+HASHTAG_TAIL = re.compile(r'\s*#.*$')
+
 
 def parse_tpvl_filename(filename: str) -> dict | None:
     """
@@ -52,14 +66,13 @@ def parse_tpvl_filename(filename: str) -> dict | None:
     season_end = int(season_match.group(2))
 
     # Extract game number (e.g., G96)
-    game_match = re.search(r'G(\d+)', filename)
+    game_match = GAME_PATTERN.search(filename)
     if not game_match:
         return None
     game_number = int(game_match.group(1))
 
     # Extract date (month/day)
-    # Handle both regular slash (/) and big solidus (⧸) Unicode character
-    date_match = re.search(r'(\d{1,2})[/⧸](\d{1,2})', filename)
+    date_match = DATE_PATTERN.search(filename)
     if not date_match:
         return None
     month = int(date_match.group(1))
@@ -73,15 +86,13 @@ def parse_tpvl_filename(filename: str) -> dict | None:
         year = 2000 + season_end
 
     # Extract teams (after time HH:MM or HH_MM)
-    # Pattern: time followed by teams separated by vs
-    # Handle both colon (:) and underscore (_) as time separator
-    teams_match = re.search(r'\d{1,2}[_:]\d{2}\s+(.+?)(?:\.mp4|$)', filename, re.IGNORECASE)
+    teams_match = TEAMS_PATTERN.search(filename)
     if not teams_match:
         return None
 
     teams_str = teams_match.group(1).strip()
     # Split by vs (case insensitive, with possible spaces)
-    teams = re.split(r'\s+vs\.?\s+', teams_str, flags=re.IGNORECASE)
+    teams = VS_SPLIT.split(teams_str)
     if len(teams) != 2:
         return None
 
@@ -89,10 +100,10 @@ def parse_tpvl_filename(filename: str) -> dict | None:
     team2 = teams[1].strip()
 
     # Remove file extension from team2 if present
-    team2 = re.sub(r'\.mp4$', '', team2, flags=re.IGNORECASE)
+    team2 = MP4_SUFFIX.sub('', team2)
 
     # Remove trailing hashtags and text (e.g., "#TPVL")
-    team2 = re.sub(r'\s*#.*$', '', team2).strip()
+    team2 = HASHTAG_TAIL.sub('', team2).strip()
 
     return {
         'game_number': game_number,
@@ -119,26 +130,25 @@ def generate_new_filename(metadata: dict) -> str:
     return f"{date_str}_{game_str}_{metadata['team1']}_vs_{metadata['team2']}.mp4"
 
 
-def get_unique_filename(directory: Path, filename: str, existing_files: set) -> str:
+def get_unique_filename(filename: str, taken: set) -> str:
     """
     Get a unique filename, adding sequence number if needed.
 
     Args:
-        directory: Target directory
         filename: Desired filename
-        existing_files: Set of filenames that will exist after rename
+        taken: Filenames already on disk plus those claimed by planned renames
 
     Returns:
         Unique filename (may have _2, _3, etc. suffix)
     """
-    if filename not in existing_files and not (directory / filename).exists():
+    if filename not in taken:
         return filename
 
     base = filename.rsplit('.mp4', 1)[0]
     counter = 2
     while True:
         new_filename = f"{base}_{counter}.mp4"
-        if new_filename not in existing_files and not (directory / new_filename).exists():
+        if new_filename not in taken:
             return new_filename
         counter += 1
 
@@ -154,22 +164,23 @@ def scan_and_plan_renames(video_dir: Path) -> list[tuple[Path, str]]:
         List of (old_path, new_filename) tuples
     """
     renames = []
-    new_filenames = set()
 
-    # Get all mp4 files
-    mp4_files = sorted(video_dir.glob('*.mp4'))
+    # One scandir pass gives both the scan list and the collision set —
+    # the per-candidate .exists() stats in the uniqueness probe are gone.
+    with os.scandir(video_dir) as entries:
+        mp4_names = sorted(e.name for e in entries if e.name.endswith('.mp4'))
+    taken = set(mp4_names)
 
-    for filepath in mp4_files:
-        metadata = parse_tpvl_filename(filepath.name)
+    for name in mp4_names:
+        metadata = parse_tpvl_filename(name)
         if metadata is None:
             continue
 
-        new_filename = generate_new_filename(metadata)
-        new_filename = get_unique_filename(video_dir, new_filename, new_filenames)
-        new_filenames.add(new_filename)
+        new_filename = get_unique_filename(generate_new_filename(metadata), taken)
+        taken.add(new_filename)
 
-        if filepath.name != new_filename:
-            renames.append((filepath, new_filename))
+        if name != new_filename:
+            renames.append((video_dir / name, new_filename))
 
     return renames
 